@@ -1,6 +1,7 @@
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
 
 from app.models.inventory import (
     InventoryHistoryResponse,
@@ -11,7 +12,7 @@ from app.models.inventory import (
     InventoryUpdateRequest,
     InventoryUpdateResponse,
 )
-from app.services.inventory_service import inventory_service
+from app.services.inventory_service import get_inventory_service
 
 router = APIRouter(prefix="/api/inventory", tags=["Inventory"])
 
@@ -22,7 +23,10 @@ router = APIRouter(prefix="/api/inventory", tags=["Inventory"])
     summary="재고 현황 조회",
 )
 async def get_inventory_status():
-    return inventory_service.get_status()
+    return Response(
+        content=get_inventory_service().get_status_raw(),
+        media_type="application/json",
+    )
 
 
 @router.get(
@@ -31,7 +35,10 @@ async def get_inventory_status():
     summary="재고 부족 알림 조회",
 )
 async def get_inventory_alerts():
-    return inventory_service.get_alerts()
+    return Response(
+        content=get_inventory_service().get_alerts_raw(),
+        media_type="application/json",
+    )
 
 
 @router.post(
@@ -41,7 +48,7 @@ async def get_inventory_alerts():
 )
 async def update_inventory(request: InventoryUpdateRequest):
     try:
-        return inventory_service.update_stock(request)
+        return await get_inventory_service().update_stock_async(request)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
@@ -54,7 +61,7 @@ async def update_inventory(request: InventoryUpdateRequest):
 )
 async def apply_sensor_data(request: InventorySensorRequest):
     try:
-        return inventory_service.apply_sensor_measurement(request)
+        return await get_inventory_service().apply_sensor_measurement_async(request)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -68,4 +75,4 @@ async def get_inventory_history(
     product_id: Optional[str] = Query(None, description="특정 상품 ID 필터"),
     limit: int = Query(50, ge=1, le=200, description="가져올 이력 개수"),
 ):
-    return inventory_service.get_history(product_id=product_id, limit=limit)
+    return get_inventory_service().get_history(product_id=product_id, limit=limit)
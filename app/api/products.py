@@ -191,7 +191,8 @@ async def search_products(
     in_stock: Optional[bool] = Query(True, description="재고 있는 상품만"),
     sort_by: SortBy = Query(SortBy.POPULARITY, description="정렬 기준"),
     page: int = Query(1, ge=1, description="페이지 번호"),
-    page_size: int = Query(20, ge=1, le=100, description="페이지 크기")
+    page_size: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor)")
 ):
     """
     상품 검색
@@ -212,6 +213,10 @@ async def search_products(
     - recent: 최신순
     - discount: 할인율순
     
+    **페이지네이션:**
+    - page: 페이지 번호로 이동
+    - cursor: 이전 응답의 next_cursor를 넘기면 그 다음 페이지를 조회
+    
     Returns:
         ProductSearchResponse: 검색 결과
     """
@@ -240,7 +245,8 @@ async def search_products(
             in_stock=in_stock,
             sort_by=sort_by,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            cursor=cursor
         )
         
         result = await product_service.search_products(params)
@@ -250,6 +256,8 @@ async def search_products(
             **result
         )
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
         logger.error(f"상품 검색 실패: {str(e)}")
         raise HTTPException(
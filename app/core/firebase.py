@@ -1,6 +1,6 @@
 # app/core/firebase.py
 import firebase_admin
-from firebase_admin import credentials, firestore, db
+from firebase_admin import credentials, firestore, firestore_async, db
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -12,6 +12,7 @@ class FirebaseService:
     
     def __init__(self):
         self.firestore_db = None
+        self.firestore_async_db = None
         self.realtime_db = None
         self._initialize()
     
@@ -48,6 +49,9 @@ class FirebaseService:
         # Firestore 클라이언트
         self.firestore_db = firestore.client()
         
+        # Firestore 비동기 클라이언트 (asyncio 네이티브, 스레드 풀 불필요)
+        self.firestore_async_db = firestore_async.client()
+        
         # Realtime Database 레퍼런스
         try:
             self.realtime_db = db.reference()
@@ -149,4 +153,5 @@ firebase_service = FirebaseService()
 
 # Export
 firestore_db = firebase_service.firestore_db
+firestore_async_db = firebase_service.firestore_async_db
 realtime_db = firebase_service.realtime_db
\ No newline at end of file
@@ -6,7 +6,7 @@ from typing import Optional
 import paho.mqtt.client as mqtt
 
 from app.models.inventory import InventorySensorRequest
-from app.services.inventory_service import inventory_service
+from app.services.inventory_service import get_inventory_service
 from app.core.firebase import firebase_service
 
 
@@ -91,7 +91,7 @@ class MQTTInventoryBridge:
             return
 
         try:
-            response = inventory_service.apply_sensor_measurement(request)
+            response = get_inventory_service().apply_sensor_measurement(request)
             self._sync_to_firebase(response)
             logger.info(
                 "MQTT sensor update applied product=%s sensor=%s stock=%s",
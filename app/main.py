@@ -1,6 +1,10 @@
 # app/main.py
 
 import logging
+from dotenv import load_dotenv
+
+# 환경 변수는 서비스 모듈 import 전에 한 번만 로드
+load_dotenv()
 
 # 로깅 설정 - DEBUG 레벨로
 logging.basicConfig(
@@ -13,7 +17,6 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.core.firebase import firebase_service, firestore_db, realtime_db
 from firebase_admin import firestore
-from dotenv import load_dotenv
 import os
 from datetime import datetime
 
@@ -23,8 +26,9 @@ from app.api import payment  # 결제 API 라우터
 from app.api import inventory
 from app.api.ai_recommendations import router as ai_router
 from app.core.mqtt_client import mqtt_bridge
-
-load_dotenv()
+from app.services.inventory_service import get_inventory_service
+from app.services.payment_service import payment_service
+from app.services.product_service import product_service
 
 app = FastAPI(
     title=os.getenv("PROJECT_NAME", "올리브영 Smart Cart API"),
@@ -93,14 +97,19 @@ async def health_check():
 
 @app.on_event("startup")
 async def on_startup():
-    """애플리케이션 시작 시 MQTT 브리지를 활성화."""
+    """애플리케이션 시작 시 MQTT 브리지와 상품 실시간 리스너를 활성화."""
+    # MQTT 스레드가 접근하기 전에 재고 서비스 싱글톤을 미리 생성
+    get_inventory_service()
     mqtt_bridge.start()
+    product_service.start_listener()
 
 
 @app.on_event("shutdown")
 async def on_shutdown():
-    """애플리케이션 종료 시 MQTT 연결을 정리."""
+    """애플리케이션 종료 시 MQTT 연결, 상품 리스너, Toss API 클라이언트를 정리."""
     mqtt_bridge.stop()
+    product_service.stop_listener()
+    await payment_service.aclose()
 
 
 # ==================== Firestore 테스트 엔드포인트 ====================
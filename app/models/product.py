@@ -90,6 +90,7 @@ class ProductSearchParams(BaseModel):
     sort_by: SortBy = Field(SortBy.POPULARITY, description="정렬 기준")
     page: int = Field(1, ge=1, description="페이지 번호")
     page_size: int = Field(20, ge=1, le=100, description="페이지 크기")
+    cursor: Optional[str] = Field(None, description="이전 응답의 next_cursor (지정 시 page 대신 사용)")
 
     @validator('max_price')
     def validate_price_range(cls, v, values):
@@ -108,6 +109,7 @@ class ProductSearchResponse(BaseModel):
     page_size: int = Field(..., description="페이지 크기")
     total_pages: int = Field(..., description="전체 페이지 수")
     products: List[ProductSummary]
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 None)")
 
 
 # ==================== 추천 요청/응답 ====================
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from threading import Lock
 from typing import Dict, List, Optional
 
@@ -30,6 +33,15 @@ class InventoryService:
         self._items: Dict[str, InventoryItem] = {}
         self._history: List[InventoryHistoryRecord] = []
         self._lock = Lock()
+        # Firestore/Realtime DB 쓰기는 블로킹 호출이므로 전용 스레드 풀에서 실행
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="inv-io")
+        # 재고가 바뀔 때만 다시 계산하는 상태/알림 스냅샷
+        self._version = 0
+        self._status_snapshot: Optional[InventoryStatusResponse] = None
+        self._alerts_snapshot: Optional[InventoryAlertsResponse] = None
+        # 직렬화된 JSON 응답 캐시 (라우터가 Pydantic 검증 없이 그대로 반환)
+        self._status_json: Optional[bytes] = None
+        self._alerts_json: Optional[bytes] = None
         self._seed_inventory()
 
     def _seed_inventory(self) -> None:
@@ -155,19 +167,74 @@ class InventoryService:
                 logger.error("Realtime DB ?? ??? ??(%s): %s", item.product_id, exc)
 
 
+    def _invalidate_snapshots(self) -> None:
+        self._version += 1
+        self._status_snapshot = None
+        self._alerts_snapshot = None
+        self._status_json = None
+        self._alerts_json = None
+
     def get_status(self) -> InventoryStatusResponse:
-        items = list(self._items.values())
-        low_stock = [item for item in items if item.current_stock <= item.threshold]
+        snapshot = self._status_snapshot
+        if snapshot is None:
+            version = self._version
+            snapshot = self._build_status()
+            # 버전 확인과 저장을 잠금 안에서 묶어, 그 사이 재고 변경이 끼어들면 저장하지 않음
+            with self._lock:
+                if version == self._version:
+                    self._status_snapshot = snapshot
+        return snapshot
+
+    def get_status_raw(self) -> bytes:
+        """get_status 응답을 JSON 바이트로 반환 (재고 변경 전까지 캐시)."""
+        payload = self._status_json
+        if payload is None:
+            version = self._version
+            payload = self.get_status().model_dump_json().encode()
+            with self._lock:
+                if version == self._version:
+                    self._status_json = payload
+        return payload
+
+    def _build_status(self) -> InventoryStatusResponse:
+        # I/O 스레드 풀의 update_stock이 동시에 항목을 추가할 수 있으므로 잠금 상태에서 복사
+        with self._lock:
+            items = list(self._items.values())
+        low_stock_count = sum(1 for item in items if item.current_stock <= item.threshold)
         return InventoryStatusResponse(
             success=True,
             total_items=len(items),
-            low_stock_count=len(low_stock),
+            low_stock_count=low_stock_count,
             items=items,
         )
 
     def get_alerts(self) -> InventoryAlertsResponse:
+        snapshot = self._alerts_snapshot
+        if snapshot is None:
+            version = self._version
+            snapshot = self._build_alerts()
+            # 버전 확인과 저장을 잠금 안에서 묶어, 그 사이 재고 변경이 끼어들면 저장하지 않음
+            with self._lock:
+                if version == self._version:
+                    self._alerts_snapshot = snapshot
+        return snapshot
+
+    def get_alerts_raw(self) -> bytes:
+        """get_alerts 응답을 JSON 바이트로 반환 (재고 변경 전까지 캐시)."""
+        payload = self._alerts_json
+        if payload is None:
+            version = self._version
+            payload = self.get_alerts().model_dump_json().encode()
+            with self._lock:
+                if version == self._version:
+                    self._alerts_json = payload
+        return payload
+
+    def _build_alerts(self) -> InventoryAlertsResponse:
         alerts: List[InventoryAlert] = []
-        for item in self._items.values():
+        with self._lock:
+            items = list(self._items.values())
+        for item in items:
             if item.current_stock <= item.threshold:
                 ratio = (
                     item.current_stock / item.threshold
@@ -206,6 +273,7 @@ class InventoryService:
                 note=request.reason,
             )
 
+            self._invalidate_snapshots()
             self._sync_inventory_state(item, source=source)
 
             return InventoryUpdateResponse(
@@ -214,6 +282,17 @@ class InventoryService:
                 item=item,
             )
 
+    async def update_stock_async(
+        self,
+        request: InventoryUpdateRequest,
+        source: str = "manual",
+    ) -> InventoryUpdateResponse:
+        """이벤트 루프를 막지 않도록 update_stock을 I/O 스레드 풀에서 실행한다."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._io_pool, partial(self.update_stock, request, source)
+        )
+
     def apply_sensor_measurement(
         self,
         request: InventorySensorRequest,
@@ -237,6 +316,7 @@ class InventoryService:
                 source=f"sensor:{request.sensor_id}",
                 note=f"측정 무게 {request.measured_weight}{request.unit}",
             )
+            self._invalidate_snapshots()
             self._sync_inventory_state(item, source=f"sensor:{request.sensor_id}")
 
 
@@ -248,6 +328,16 @@ class InventoryService:
                 item=item,
             )
 
+    async def apply_sensor_measurement_async(
+        self,
+        request: InventorySensorRequest,
+    ) -> InventorySensorResponse:
+        """이벤트 루프를 막지 않도록 apply_sensor_measurement를 I/O 스레드 풀에서 실행한다."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._io_pool, partial(self.apply_sensor_measurement, request)
+        )
+
     def get_history(
         self,
         product_id: Optional[str] = None,
@@ -285,4 +375,21 @@ class InventoryService:
         self._history.append(record)
 
 
-inventory_service = InventoryService()
+_inventory_service: Optional[InventoryService] = None
+_inventory_service_lock = Lock()
+
+
+def get_inventory_service() -> InventoryService:
+    """재고 서비스 싱글톤을 반환한다.
+
+    MQTT 스레드와 요청 처리 스레드가 동시에 처음 접근해도 인스턴스가 하나만
+    생성되도록 생성 구간을 잠금으로 보호한다.
+    """
+    global _inventory_service
+    service = _inventory_service
+    if service is None:
+        with _inventory_service_lock:
+            service = _inventory_service
+            if service is None:
+                service = _inventory_service = InventoryService()
+    return service
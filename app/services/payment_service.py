@@ -4,17 +4,22 @@
 Toss Payments API 연동
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Awaitable, Callable, Tuple, Type, TypeVar
+import asyncio
 import httpx
+import random
+import sys
 import base64
 import os
 import uuid
-from datetime import datetime
-from dotenv import load_dotenv
+from datetime import datetime, timezone
+from types import MappingProxyType
 import logging
-import json
+import orjson
 
-from app.core.firebase import firestore_db
+from google.api_core import exceptions as gcp_exceptions
+
+from app.core.firebase import firestore_async_db
 from app.models.payment import (
     PaymentInitiateRequest,
     PaymentInitiateResponse,
@@ -28,34 +33,106 @@ from app.models.payment import (
     PaymentItem
 )
 
-load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Toss Payments 설정 (.env는 app.main 진입점에서 로드, 프로세스 시작 시 한 번만 읽음)
+_TOSS_CLIENT_KEY = os.getenv("TOSS_CLIENT_KEY")
+_TOSS_SECRET_KEY = os.getenv("TOSS_SECRET_KEY")
+_TOSS_SUCCESS_URL = os.getenv("TOSS_SUCCESS_URL", "http://localhost:3000/payment/success")
+_TOSS_FAIL_URL = os.getenv("TOSS_FAIL_URL", "http://localhost:3000/payment/fail")
+
+T = TypeVar("T")
+
+if sys.version_info >= (3, 11):
+    # 3.11+ fromisoformat은 RFC3339의 'Z' 접미사를 직접 처리
+    _parse_rfc3339 = datetime.fromisoformat
+else:
+    def _parse_rfc3339(value: str) -> datetime:
+        """RFC3339 문자열 파싱 ('Z' → '+00:00')"""
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        return datetime.fromisoformat(value)
+
+# 재시도 대상 일시 오류 (Toss 네트워크 오류 / Firestore 일시 장애)
+TOSS_RETRY_ERRORS: Tuple[Type[BaseException], ...] = (httpx.TransportError,)
+FIRESTORE_RETRY_ERRORS: Tuple[Type[BaseException], ...] = (
+    gcp_exceptions.Aborted,
+    gcp_exceptions.DeadlineExceeded,
+    gcp_exceptions.ServiceUnavailable,
+)
+
+
+async def _with_retry(
+    func: Callable[[], Awaitable[T]],
+    retry_on: Tuple[Type[BaseException], ...],
+    attempts: int = 3,
+    initial_delay: float = 0.2,
+    max_delay: float = 2.0
+) -> T:
+    """일시 오류에 대해 지수 백오프(+지터)로 재시도"""
+    for attempt in range(1, attempts + 1):
+        try:
+            return await func()
+        except retry_on as e:
+            if attempt == attempts:
+                raise
+            delay = min(max_delay, initial_delay * 2 ** (attempt - 1))
+            delay += random.uniform(0, delay)
+            logger.warning(f"일시 오류로 재시도 ({attempt}/{attempts}, {delay:.2f}s 후): {e!r}")
+            await asyncio.sleep(delay)
+
 
 class PaymentService:
     """결제 서비스 클래스"""
     
+    __slots__ = (
+        "db", "orders_collection", "payments_collection",
+        "_orders_col", "_payments_col",
+        "client_key", "secret_key", "success_url", "fail_url",
+        "api_base_url", "_auth_b64", "auth_headers", "_http", "_toss_sem",
+    )
+    
     def __init__(self):
-        self.db = firestore_db
+        self.db = firestore_async_db
         self.orders_collection = "orders"
         self.payments_collection = "payments"
+        self._orders_col = self.db.collection(self.orders_collection)
+        self._payments_col = self.db.collection(self.payments_collection)
         
         # Toss Payments 설정
-        self.client_key = os.getenv("TOSS_CLIENT_KEY")
-        self.secret_key = os.getenv("TOSS_SECRET_KEY")
-        self.success_url = os.getenv("TOSS_SUCCESS_URL", "http://localhost:3000/payment/success")
-        self.fail_url = os.getenv("TOSS_FAIL_URL", "http://localhost:3000/payment/fail")
+        self.client_key = _TOSS_CLIENT_KEY
+        self.secret_key = _TOSS_SECRET_KEY
+        self.success_url = _TOSS_SUCCESS_URL
+        self.fail_url = _TOSS_FAIL_URL
         
         # Toss API URL
         self.api_base_url = "https://api.tosspayments.com/v1"
         
-        # 인증 헤더
-        credentials = f"{self.secret_key}:"
-        encoded_credentials = base64.b64encode(credentials.encode()).decode()
-        self.auth_headers = {
-            "Authorization": f"Basic {encoded_credentials}",
+        # 인증 헤더 (Basic 자격 증명은 한 번만 인코딩하고 읽기 전용으로 고정)
+        self._auth_b64 = base64.b64encode(f"{self.secret_key}:".encode("ascii")).decode("ascii")
+        self.auth_headers = MappingProxyType({
+            "Authorization": f"Basic {self._auth_b64}",
             "Content-Type": "application/json"
-        }
+        })
+        
+        # Toss API 클라이언트 (커넥션 풀/keep-alive 재사용)
+        self._http = httpx.AsyncClient(
+            base_url=self.api_base_url,
+            headers=self.auth_headers,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+        # 동시 Toss 호출 상한 (급증 시 풀 고갈/타임아웃 대신 대기열로 흡수)
+        self._toss_sem = asyncio.Semaphore(40)
+    
+    async def _post_toss(self, path: str, body: bytes, headers: Dict[str, str]) -> httpx.Response:
+        """동시 요청 수를 제한하여 Toss API 호출"""
+        async with self._toss_sem:
+            return await self._http.post(path, content=body, headers=headers)
+    
+    async def aclose(self) -> None:
+        """Toss API 클라이언트 종료"""
+        await self._http.aclose()
     
     # ==================== 결제 시작 ====================
     
@@ -71,6 +148,9 @@ class PaymentService:
         3. QR 코드 데이터 생성
         """
         try:
+            # 주문/결제/응답에 동일한 생성 시각 사용
+            now = datetime.now(timezone.utc)
+            
             # 1. 주문 ID 생성
             order_id = self._generate_order_id()
             payment_key = self._generate_payment_key()
@@ -78,14 +158,14 @@ class PaymentService:
             # 2. 주문명 생성
             order_name = self._generate_order_name(request.items)
             
-            # 3. Firestore에 주문 저장
+            # 3. 주문 정보
             order_data = {
                 "order_id": order_id,
                 "customer_id": request.customer_id,
                 "customer_name": request.customer_name,
                 "customer_email": request.customer_email,
                 "customer_phone": request.customer_phone,
-                "items": [item.dict() for item in request.items],
+                "items": [item.model_dump() for item in request.items],
                 "total_amount": request.total_amount,
                 "discount_amount": request.total_amount - request.final_amount,
                 "use_points": request.use_points,
@@ -94,15 +174,12 @@ class PaymentService:
                 "payment_method": None,
                 "payment_status": PaymentStatus.READY.value,
                 "order_status": OrderStatus.PENDING.value,
-                "created_at": datetime.now(),
+                "created_at": now,
                 "paid_at": None,
                 "canceled_at": None
             }
             
-            self.db.collection(self.orders_collection).document(order_id).set(order_data)
-            logger.info(f"주문 생성 완료: {order_id}")
-            
-            # 4. 결제 정보 저장
+            # 4. 결제 정보
             payment_data = {
                 "payment_key": payment_key,
                 "order_id": order_id,
@@ -110,10 +187,15 @@ class PaymentService:
                 "order_name": order_name,
                 "customer_name": request.customer_name,
                 "status": PaymentStatus.READY.value,
-                "created_at": datetime.now()
+                "created_at": now
             }
             
-            self.db.collection(self.payments_collection).document(payment_key).set(payment_data)
+            # 주문/결제 문서를 하나의 배치로 저장 (1회 왕복, 원자적 커밋)
+            batch = self.db.batch()
+            batch.set(self._orders_col.document(order_id), order_data)
+            batch.set(self._payments_col.document(payment_key), payment_data)
+            await _with_retry(batch.commit, FIRESTORE_RETRY_ERRORS)
+            logger.info(f"주문 생성 완료: {order_id}")
             logger.info(f"결제 정보 저장 완료: {payment_key}")
             
             # 5. 결제 페이지 URL 생성
@@ -137,7 +219,7 @@ class PaymentService:
                 customer_name=request.customer_name,
                 qr_data=qr_data,
                 checkout_url=checkout_url,
-                created_at=datetime.now()
+                created_at=now
             )
             
         except Exception as e:
@@ -157,45 +239,49 @@ class PaymentService:
         """
         try:
             # 1. Toss Payments 승인 API 호출
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_base_url}/payments/confirm",
-                    headers=self.auth_headers,
-                    json={
-                        "paymentKey": request.payment_key,
-                        "orderId": request.order_id,
-                        "amount": request.amount
-                    },
-                    timeout=30.0
-                )
-                
-                if response.status_code != 200:
-                    error_data = response.json()
-                    logger.error(f"Toss 결제 승인 실패: {error_data}")
-                    raise Exception(f"결제 승인 실패: {error_data.get('message', 'Unknown error')}")
-                
-                toss_response = response.json()
-                logger.info(f"Toss 결제 승인 성공: {toss_response}")
+            # 재시도 시 중복 승인되지 않도록 payment_key를 멱등 키로 사용
+            body = orjson.dumps({
+                "paymentKey": request.payment_key,
+                "orderId": request.order_id,
+                "amount": request.amount
+            })
+            response = await _with_retry(
+                lambda: self._post_toss(
+                    "/payments/confirm",
+                    body,
+                    {"Idempotency-Key": request.payment_key}
+                ),
+                TOSS_RETRY_ERRORS
+            )
+            
+            if response.status_code != 200:
+                error_data = orjson.loads(response.content)
+                logger.error(f"Toss 결제 승인 실패: {error_data}")
+                raise Exception(f"결제 승인 실패: {error_data.get('message', 'Unknown error')}")
+            
+            toss_response = orjson.loads(response.content)
+            logger.info(f"Toss 결제 승인 성공: {toss_response}")
             
             # 2. Firestore 업데이트
-            approved_at = datetime.fromisoformat(toss_response['approvedAt'].replace('Z', '+00:00'))
+            approved_at = _parse_rfc3339(toss_response['approvedAt'])
             
-            # 주문 상태 업데이트
-            order_ref = self.db.collection(self.orders_collection).document(request.order_id)
-            order_ref.update({
+            order_ref = self._orders_col.document(request.order_id)
+            payment_ref = self._payments_col.document(request.payment_key)
+            
+            # 주문/결제 상태를 하나의 배치로 업데이트
+            batch = self.db.batch()
+            batch.update(order_ref, {
                 "payment_status": PaymentStatus.DONE.value,
                 "order_status": OrderStatus.PAID.value,
                 "payment_method": toss_response.get('method'),
                 "paid_at": approved_at
             })
-            
-            # 결제 정보 업데이트
-            payment_ref = self.db.collection(self.payments_collection).document(request.payment_key)
-            payment_ref.update({
+            batch.update(payment_ref, {
                 "status": PaymentStatus.DONE.value,
                 "approved_at": approved_at,
                 "toss_response": toss_response
             })
+            await _with_retry(batch.commit, FIRESTORE_RETRY_ERRORS)
             
             logger.info(f"결제 승인 완료: {request.payment_key}")
             
@@ -226,50 +312,60 @@ class PaymentService:
         """결제 취소"""
         try:
             # 1. Toss Payments 취소 API 호출
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_base_url}/payments/{request.payment_key}/cancel",
-                    headers=self.auth_headers,
-                    json={
-                        "cancelReason": request.cancel_reason,
-                        "cancelAmount": request.cancel_amount
-                    },
-                    timeout=30.0
-                )
-                
-                if response.status_code != 200:
-                    error_data = response.json()
-                    logger.error(f"Toss 결제 취소 실패: {error_data}")
-                    raise Exception(f"결제 취소 실패: {error_data.get('message', 'Unknown error')}")
-                
-                toss_response = response.json()
-                logger.info(f"Toss 결제 취소 성공: {toss_response}")
+            # 부분 취소는 여러 번 요청될 수 있으므로 멱등 키는 호출마다 새로 발급
+            body = orjson.dumps({
+                "cancelReason": request.cancel_reason,
+                "cancelAmount": request.cancel_amount
+            })
+            idempotency_key = uuid.uuid4().hex
+            response = await _with_retry(
+                lambda: self._post_toss(
+                    f"/payments/{request.payment_key}/cancel",
+                    body,
+                    {"Idempotency-Key": idempotency_key}
+                ),
+                TOSS_RETRY_ERRORS
+            )
+            
+            if response.status_code != 200:
+                error_data = orjson.loads(response.content)
+                logger.error(f"Toss 결제 취소 실패: {error_data}")
+                raise Exception(f"결제 취소 실패: {error_data.get('message', 'Unknown error')}")
+            
+            toss_response = orjson.loads(response.content)
+            logger.info(f"Toss 결제 취소 성공: {toss_response}")
             
             # 2. Firestore 업데이트
-            payment_ref = self.db.collection(self.payments_collection).document(request.payment_key)
-            payment_doc = payment_ref.get()
+            canceled_at = datetime.now(timezone.utc)
+            payment_ref = self._payments_col.document(request.payment_key)
             
-            if not payment_doc.exists:
-                raise Exception("결제 정보를 찾을 수 없습니다")
+            # 주문 ID는 클라이언트 입력이 아닌 Toss 취소 응답에서 가져옴
+            # (응답에 없을 때만 저장된 결제 문서를 조회)
+            order_id = toss_response.get("orderId")
+            if not order_id:
+                payment_doc = await payment_ref.get()
+                
+                if not payment_doc.exists:
+                    raise Exception("결제 정보를 찾을 수 없습니다")
+                
+                order_id = payment_doc.to_dict()['order_id']
             
-            payment_data = payment_doc.to_dict()
-            order_id = payment_data['order_id']
+            order_ref = self._orders_col.document(order_id)
             
-            # 주문 상태 업데이트
-            order_ref = self.db.collection(self.orders_collection).document(order_id)
-            order_ref.update({
+            # 주문/결제 상태를 하나의 배치로 업데이트
+            batch = self.db.batch()
+            batch.update(order_ref, {
                 "payment_status": PaymentStatus.CANCELED.value,
                 "order_status": OrderStatus.CANCELED.value,
-                "canceled_at": datetime.now()
+                "canceled_at": canceled_at
             })
-            
-            # 결제 정보 업데이트
-            payment_ref.update({
+            batch.update(payment_ref, {
                 "status": PaymentStatus.CANCELED.value,
-                "canceled_at": datetime.now(),
+                "canceled_at": canceled_at,
                 "cancel_reason": request.cancel_reason,
                 "toss_cancel_response": toss_response
             })
+            await _with_retry(batch.commit, FIRESTORE_RETRY_ERRORS)
             
             logger.info(f"결제 취소 완료: {request.payment_key}")
             
@@ -278,7 +374,7 @@ class PaymentService:
                 payment_key=request.payment_key,
                 order_id=order_id,
                 status=PaymentStatus.CANCELED,
-                canceled_at=datetime.now(),
+                canceled_at=canceled_at,
                 cancel_amount=request.cancel_amount or toss_response['totalAmount'],
                 cancel_reason=request.cancel_reason
             )
@@ -292,19 +388,17 @@ class PaymentService:
     async def get_order(self, order_id: str) -> Optional[Order]:
         """주문 조회"""
         try:
-            doc = self.db.collection(self.orders_collection).document(order_id).get()
+            doc = await self._orders_col.document(order_id).get()
             
             if not doc.exists:
                 logger.warning(f"주문을 찾을 수 없음: {order_id}")
                 return None
             
             data = doc.to_dict()
+            data.setdefault('items', [])
             
-            # PaymentItem 변환
-            items = [PaymentItem(**item) for item in data.get('items', [])]
-            data['items'] = items
-            
-            return Order(**data)
+            # 중첩된 items까지 pydantic-core에서 한 번에 검증
+            return Order.model_validate(data)
             
         except Exception as e:
             logger.error(f"주문 조회 실패: {order_id}, 오류: {str(e)}")
@@ -317,22 +411,25 @@ class PaymentService:
     ) -> List[Order]:
         """고객별 주문 목록 조회"""
         try:
-            docs = self.db.collection(self.orders_collection)\
-                         .where('customer_id', '==', customer_id)\
-                         .order_by('created_at', direction='DESCENDING')\
-                         .limit(limit)\
-                         .stream()
+            docs = self._orders_col\
+                       .where('customer_id', '==', customer_id)\
+                       .order_by('created_at', direction='DESCENDING')\
+                       .limit(limit)\
+                       .stream()
             
+            # 스트림 수신 중 도착한 문서부터 바로 파싱 (I/O와 파싱이 겹침)
             orders = []
-            for doc in docs:
+            failed_ids = []
+            async for doc in docs:
                 try:
                     data = doc.to_dict()
-                    items = [PaymentItem(**item) for item in data.get('items', [])]
-                    data['items'] = items
-                    orders.append(Order(**data))
-                except Exception as e:
-                    logger.warning(f"주문 파싱 실패: {doc.id}")
-                    continue
+                    data.setdefault('items', [])
+                    orders.append(Order.model_validate(data))
+                except Exception:
+                    failed_ids.append(doc.id)
+            
+            if failed_ids:
+                logger.warning(f"주문 파싱 실패 {len(failed_ids)}건: {failed_ids}")
             
             return orders
             
@@ -345,12 +442,12 @@ class PaymentService:
     def _generate_order_id(self) -> str:
         """주문 ID 생성"""
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        random_str = str(uuid.uuid4())[:8].upper()
+        random_str = uuid.uuid4().hex[:8].upper()
         return f"ORD{timestamp}{random_str}"
     
     def _generate_payment_key(self) -> str:
         """결제 키 생성"""
-        return f"PAY{str(uuid.uuid4()).replace('-', '').upper()}"
+        return f"PAY{uuid.uuid4().hex.upper()}"
     
     def _generate_order_name(self, items: List[PaymentItem]) -> str:
         """주문명 생성"""
@@ -0,0 +1,200 @@
+"""In-memory keyword and facet index over the product catalogue."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+_EMPTY: frozenset = frozenset()
+
+# Exact-match search filters that get their own postings.
+FACET_FIELDS = ("first_category", "mid_category", "brand")
+
+# List-valued fields indexed per element (a product is posted under each value).
+MULTI_FACET_FIELDS = ("skin_types",)
+
+
+def _grams(text: str) -> Set[str]:
+    """Character unigrams and bigrams of ``text``."""
+    grams = set(text)
+    grams.update(text[i : i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+def query_tokens(query: str) -> Tuple[str, ...]:
+    """Lowercased, de-duplicated whitespace tokens of a search query."""
+    return tuple(dict.fromkeys(query.lower().split()))
+
+
+def _query_grams(keyword: str) -> Set[str]:
+    if len(keyword) == 1:
+        return {keyword}
+    return {keyword[i : i + 2] for i in range(len(keyword) - 1)}
+
+
+class ProductIndex:
+    """Character n-gram inverted index with substring-match semantics.
+
+    Korean product names are not whitespace-tokenised reliably, so postings are
+    keyed by character unigrams/bigrams of each product's ``search_blob``. A
+    lookup intersects the postings of the keyword's bigrams and then confirms
+    each candidate with a real substring check against the blob, so results
+    equal a ``keyword in field`` scan over name, brand and ingredients.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[str]] = {}
+        self._texts: Dict[str, str] = {}
+        # (field, value) -> ids, plus each id's indexed facet keys for removal
+        self._facets: Dict[Tuple[str, Any], Set[str]] = {}
+        self._doc_facets: Dict[str, Tuple[Tuple[str, Any], ...]] = {}
+        # (price, id) kept sorted for range lookups, and ids with stock left
+        self._price_order: List[Tuple[int, str]] = []
+        self._prices: Dict[str, int] = {}
+        self._in_stock: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._texts
+
+    def add(self, doc_id: str, data: Dict[str, Any]) -> None:
+        """Index (or re-index) a normalised product."""
+        if doc_id in self._texts:
+            self.remove(doc_id)
+        text = data["search_blob"]
+        self._texts[doc_id] = text
+        for gram in _grams(text):
+            self._postings.setdefault(gram, set()).add(doc_id)
+
+        # Search filters are strings, so only string values are posted; this
+        # also keeps stray map/list values from breaking the index.
+        facet_keys = tuple(
+            (field, data[field])
+            for field in FACET_FIELDS
+            if data.get(field) and isinstance(data[field], str)
+        ) + tuple(
+            (field, value)
+            for field in MULTI_FACET_FIELDS
+            for value in dict.fromkeys(data.get(field) or ())
+        )
+        self._doc_facets[doc_id] = facet_keys
+        for facet_key in facet_keys:
+            self._facets.setdefault(facet_key, set()).add(doc_id)
+
+        price = data.get("price", 0)
+        self._prices[doc_id] = price
+        insort(self._price_order, (price, doc_id))
+        if data.get("stock", {}).get("current", 0) > 0:
+            self._in_stock.add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        text = self._texts.pop(doc_id, None)
+        if text is None:
+            return
+        for gram in _grams(text):
+            postings = self._postings.get(gram)
+            if postings is None:
+                continue
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[gram]
+
+        for facet_key in self._doc_facets.pop(doc_id, ()):
+            members = self._facets.get(facet_key)
+            if members is None:
+                continue
+            members.discard(doc_id)
+            if not members:
+                del self._facets[facet_key]
+
+        price = self._prices.pop(doc_id, None)
+        if price is not None:
+            del self._price_order[bisect_left(self._price_order, (price, doc_id))]
+        self._in_stock.discard(doc_id)
+
+    def build(self, products: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        for doc_id, data in products:
+            self.add(doc_id, data)
+
+    def search(self, query: str) -> Set[str]:
+        """Return ids where every token of ``query`` occurs in name, brand or ingredients."""
+        tokens = query_tokens(query)
+        if not tokens:
+            return set(self._texts)
+
+        grams: Set[str] = set()
+        for token in tokens:
+            grams |= _query_grams(token)
+        postings = sorted(
+            (self._postings.get(gram, _EMPTY) for gram in grams),
+            key=len,
+        )
+        candidates = set(postings[0])
+        for other in postings[1:]:
+            if not candidates:
+                break
+            candidates &= other
+
+        texts = self._texts
+        if len(tokens) == 1:
+            keyword = tokens[0]
+            return {doc_id for doc_id in candidates if keyword in texts[doc_id]}
+        return {
+            doc_id
+            for doc_id in candidates
+            if all(token in texts[doc_id] for token in tokens)
+        }
+
+    def filter_facets(self, doc_ids: Set[str], **facets: Optional[str]) -> Set[str]:
+        """Narrow ``doc_ids`` to products whose facet fields equal the given values.
+
+        Unset (``None``/empty) facets are ignored; each set one costs a single
+        set intersection against its postings.
+        """
+        for field, value in facets.items():
+            if not value:
+                continue
+            if not doc_ids:
+                break
+            doc_ids = doc_ids & self._facets.get((field, value), _EMPTY)
+        return doc_ids
+
+    def facet_members(self, field: str, values: Iterable[Any]) -> Set[str]:
+        """Ids posted under any of ``values`` for ``field``."""
+        members: Set[str] = set()
+        for value in values:
+            members |= self._facets.get((field, value), _EMPTY)
+        return members
+
+    def filter_price(
+        self,
+        doc_ids: Set[str],
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        in_stock: bool = False,
+    ) -> Set[str]:
+        """Narrow ``doc_ids`` to an inclusive price range and, optionally, to in-stock ids.
+
+        Walks the sorted price slice when it is smaller than ``doc_ids``,
+        otherwise checks each id's price directly.
+        """
+        if min_price is not None or max_price is not None:
+            order = self._price_order
+            lo = 0 if min_price is None else bisect_left(order, (min_price,))
+            hi = len(order) if max_price is None else bisect_left(order, (max_price + 1,))
+            if hi - lo < len(doc_ids):
+                doc_ids = doc_ids.intersection(doc_id for _, doc_id in order[lo:hi])
+            else:
+                low = float("-inf") if min_price is None else min_price
+                high = float("inf") if max_price is None else max_price
+                prices = self._prices
+                doc_ids = {
+                    doc_id
+                    for doc_id in doc_ids
+                    if doc_id in prices and low <= prices[doc_id] <= high
+                }
+        if in_stock:
+            doc_ids = doc_ids & self._in_stock
+        return doc_ids
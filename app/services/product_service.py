@@ -3,52 +3,388 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache, partial
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
 
+import asyncio
+import base64
+import heapq
 import logging
+import math
+import re
+import time
 
-from app.core.firebase import firestore_db
+from pydantic import ValidationError
+
+from app.core.firebase import firestore_async_db, firestore_db
 from app.models.product import (
     BrandInfo,
     CategoryInfo,
     FilterOptions,
     ProductDetail,
     ProductSearchParams,
+    ProductStock,
     ProductSummary,
     RecommendationRequest,
     SortBy,
     SubCategoryInfo,
 )
+from app.services.product_index import ProductIndex, query_tokens
 
 logger = logging.getLogger(__name__)
 
+# How long catalogue-wide aggregates (facets, counts) are served from memory.
+# The snapshot listener drops them on every product change, so the TTL only
+# bounds staleness when the listener is not running.
+AGGREGATE_CACHE_TTL_SECONDS = 300.0
+
+# Documents pulled per worker-thread hop when streaming a query.
+STREAM_CHUNK_SIZE = 64
+
+# Document references resolved per batched get_all() call.
+GET_ALL_CHUNK_SIZE = 100
+
+# Concurrent blocking Firestore RPCs allowed in the worker-thread pool.
+FIRESTORE_MAX_CONCURRENCY = 50
+
+# Upper bound on memoised normalised documents (roughly the catalogue size).
+NORMALIZED_CACHE_MAX_ENTRIES = 20000
+
+# Memoised ProductDetail models; detail pages touch far fewer products.
+DETAIL_CACHE_MAX_ENTRIES = 2000
+
+# Every raw field _normalize_product_data reads. Listing queries project onto
+# these so unrelated crawl metadata (detailUrl, dispCatNo, page_idx, ...) is
+# never transferred or decoded; the normalised output is unchanged.
+_PRODUCT_FIELDS = [
+    "product_id", "goodsNo", "goods_no",
+    "name", "brand",
+    "category", "first_category", "sub_category", "mid_category",
+    "price", "price_cur", "priceCur",
+    "original_price", "price_org", "priceOrg", "discount_rate",
+    "is_active", "stock",
+    "description", "usage", "caution",
+    "ingredients", "skin_types", "spec",
+    "image_url", "image",
+    "created_at", "updated_at", "zone",
+]
+
+# ProductSummary fields whose stored type is not fixed by normalisation.
+_SUMMARY_STR_FIELDS = ("product_id", "name", "brand", "category", "sub_category")
+_SUMMARY_OPTIONAL_STR_FIELDS = ("zone", "image_url")
+
+# Joins the fields of a product's search_blob; never part of a search keyword.
+SEARCH_BLOB_SEPARATOR = "\x00"
+
+# Spec values meaning "suitable for every skin type".
+UNIVERSAL_SKIN_TERMS = frozenset({"모든 피부 타입", "모든피부", "모든 피부"})
+
+_LIST_SEPARATORS = str.maketrans("/|·;", ",,,,")
+_NUMBER_RE = re.compile(r"[-+]?\d[\d,]*(?:\.\d+)?")
+
+
+def _timestamp(value: Any) -> float:
+    """Epoch seconds of a stored timestamp; missing values sort as oldest."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float("-inf")
+
+
+def _to_int(value: Any) -> int:
+    """Convert loosely formatted values into integers."""
+    value_type = type(value)
+    if value_type is int:
+        return value
+    if value is None:
+        return 0
+    if value_type is bool:
+        return int(value)
+    if isinstance(value, float):
+        # NaN/inf would make int() raise; treat them as missing.
+        return int(value) if math.isfinite(value) else 0
+    if isinstance(value, int):
+        return int(value)
+    text = str(value).replace(",", "").strip()
+    if not text:
+        return 0
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return int(float(text))
+    except (ValueError, OverflowError):
+        pass
+    # e.g. "12,000원" -> 12000
+    match = _NUMBER_RE.search(str(value))
+    if match is None:
+        return 0
+    try:
+        return int(float(match.group().replace(",", "")))
+    except OverflowError:
+        return 0
+
+
+@lru_cache(maxsize=4096)
+def _split_text(text: str) -> Tuple[str, ...]:
+    """Split a delimited string into stripped, non-empty parts."""
+    parts = (part.strip() for part in text.translate(_LIST_SEPARATORS).split(","))
+    return tuple(part for part in parts if part)
+
+
+class _WorstFirst(tuple):
+    """Heap entry with reversed ordering, so a min-heap keeps its worst entry on top."""
+
+    __slots__ = ()
+
+    def __lt__(self, other: tuple) -> bool:
+        return tuple.__gt__(self, other)
+
+
+def _encode_cursor(rank: float, doc_id: str) -> str:
+    """Opaque search cursor for the (rank, doc id) of a page's last product."""
+    return base64.urlsafe_b64encode(f"{rank!r}|{doc_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        rank, doc_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return float(rank), doc_id
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid search cursor") from exc
+
 
 class ProductService:
     """Encapsulates all product queries against Firestore."""
 
     def __init__(self) -> None:
         self.db = firestore_db
+        self.async_db = firestore_async_db
         self.collection = "products"
+        self._agg_cache: Dict[Tuple[Any, ...], Tuple[float, Any]] = {}
+        # Bumped on every invalidation; scans started before it are not cached.
+        self._agg_generation = 0
+        # doc_id -> (snapshot update_time, normalised data)
+        self._norm_cache: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+        # product_id -> (normalised data it was built from, model)
+        self._summary_cache: Dict[str, Tuple[Dict[str, Any], ProductSummary]] = {}
+        self._detail_cache: Dict[str, Tuple[Dict[str, Any], ProductDetail]] = {}
+        # Keyword/facet index over the live mirror; only valid while _live_ready is set.
+        self._text_index: Optional[ProductIndex] = None
+        self._firestore_sem = asyncio.Semaphore(FIRESTORE_MAX_CONCURRENCY)
+        # Live catalogue mirrored by the products on_snapshot listener.
+        self._live_docs: Dict[str, Any] = {}
+        self._live_ready = asyncio.Event()
+        self._watch: Optional[Any] = None
+        self._watch_generation = 0
+        self._initial_snapshot_applied = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ------------------------------------------------------------------ #
+    # Live catalogue
+    # ------------------------------------------------------------------ #
+
+    def start_listener(self) -> None:
+        """Mirror the products collection in memory via an ``on_snapshot`` listener.
+
+        Must be called from the running event loop (application startup).
+        Until the first snapshot has been applied, reads fall back to
+        Firestore scans.
+        """
+        if self._watch is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._subscribe()
+
+    def stop_listener(self) -> None:
+        if self._watch is None:
+            return
+        self._watch.unsubscribe()
+        self._watch = None
+        self._reset_live_state()
+
+    def _subscribe(self) -> None:
+        # Callbacks carry their subscription's generation so deltas still
+        # queued from a dropped listener are ignored after a resubscribe.
+        self._watch_generation += 1
+        self._initial_snapshot_applied = False
+        self._watch = self.db.collection(self.collection).on_snapshot(
+            partial(self._on_snapshot, self._watch_generation)
+        )
+
+    def _resubscribe(self) -> None:
+        """Drop the mirror and listen again, so the next snapshot is a full one."""
+        logger.warning("Restarting the product listener")
+        if self._watch is not None:
+            self._watch.unsubscribe()
+        self._reset_live_state()
+        self._subscribe()
+
+    def _reset_live_state(self) -> None:
+        self._initial_snapshot_applied = False
+        self._live_ready.clear()
+        self._live_docs = {}
+
+    def _on_snapshot(
+        self, generation: int, snapshots: Any, changes: Any, read_time: Any
+    ) -> None:
+        """Listener callback; runs on the Firestore watch thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        deltas = [(change.type.name, change.document) for change in changes]
+        loop.call_soon_threadsafe(self._apply_snapshot, generation, deltas)
+
+    def _apply_snapshot(self, generation: int, deltas: List[Tuple[str, Any]]) -> None:
+        """Apply listener deltas to the live mirror and its index (event loop only).
+
+        The first snapshot of a subscription lists the whole collection and
+        is built into fresh structures that are only published once it has
+        been applied completely. Any failure while applying a batch restarts
+        the listener instead of leaving a partial mirror behind.
+        """
+        if self._watch is None or generation != self._watch_generation:
+            return
+        initial = not self._initial_snapshot_applied
+        if initial:
+            live_docs: Dict[str, Any] = {}
+            index = ProductIndex()
+        else:
+            live_docs = self._live_docs
+            index = self._text_index
+
+        try:
+            for change_type, doc in deltas:
+                if change_type != "ADDED":
+                    # Never trust a memoised normalisation across a change.
+                    self._norm_cache.pop(doc.id, None)
+                live_docs.pop(doc.id, None)
+                index.remove(doc.id)
+                if change_type == "REMOVED":
+                    continue
+                try:
+                    index.add(doc.id, self._normalize_doc(doc))
+                except Exception as index_error:
+                    index.remove(doc.id)
+                    logger.warning("Skipping product %s from listener: %s", doc.id, index_error)
+                    continue
+                live_docs[doc.id] = doc
+        except Exception:
+            logger.exception("Failed to apply product snapshot")
+            self._resubscribe()
+            return
+
+        self._invalidate_aggregates()
+        if initial:
+            self._live_docs = live_docs
+            self._text_index = index
+            self._initial_snapshot_applied = True
+            self._live_ready.set()
+            logger.info("Product listener live with %d documents", len(live_docs))
 
     # ------------------------------------------------------------------ #
     # Helpers
     # ------------------------------------------------------------------ #
 
-    def _to_int(self, value: Any) -> int:
-        """Convert loosely formatted values into integers."""
-        if value is None:
-            return 0
-        if isinstance(value, bool):
-            return int(value)
-        if isinstance(value, (int, float)):
-            return int(value)
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking Firestore call in a worker thread, capped by the RPC semaphore."""
+        async with self._firestore_sem:
+            return await asyncio.to_thread(func, *args)
+
+    async def _fetch_docs(self, query: Any) -> List[Any]:
+        """Materialise a small (``limit``-ed) sync query off the event loop."""
+        return await self._run_blocking(lambda: list(query.stream()))
+
+    async def _stream_docs(self, query: Any) -> AsyncIterator[Any]:
+        """Iterate a sync Firestore query without blocking the event loop.
+
+        Chunks are fetched in a worker thread, and the next chunk is requested
+        before the current one is handed to the caller, so network reads
+        overlap with normalisation.
+        """
+        iterator = iter(query.stream())
+
+        def next_chunk() -> List[Any]:
+            return list(islice(iterator, STREAM_CHUNK_SIZE))
+
+        pending = asyncio.ensure_future(self._run_blocking(next_chunk))
         try:
-            cleaned = str(value).replace(",", "").strip()
-            if not cleaned:
-                return 0
-            return int(float(cleaned))
-        except (ValueError, TypeError):
-            return 0
+            while True:
+                chunk = await pending
+                if not chunk:
+                    return
+                pending = asyncio.ensure_future(self._run_blocking(next_chunk))
+                for doc in chunk:
+                    yield doc
+        finally:
+            if not pending.done():
+                pending.cancel()
+
+    async def _get_docs(self, doc_ids: Iterable[str]) -> AsyncIterator[Any]:
+        """Fetch known documents with batched ``get_all`` calls, skipping missing ones."""
+        if self._live_ready.is_set():
+            live_docs = self._live_docs
+            for doc in [live_docs.get(doc_id) for doc_id in doc_ids]:
+                if doc is not None:
+                    yield doc
+            return
+
+        collection = self.db.collection(self.collection)
+        refs = [collection.document(doc_id) for doc_id in doc_ids]
+        for start in range(0, len(refs), GET_ALL_CHUNK_SIZE):
+            chunk = refs[start : start + GET_ALL_CHUNK_SIZE]
+            docs = await self._run_blocking(
+                lambda: list(self.db.get_all(chunk, field_paths=_PRODUCT_FIELDS))
+            )
+            for doc in docs:
+                if doc.exists:
+                    yield doc
+
+    async def _catalog_docs(self, query: Any) -> AsyncIterator[Any]:
+        """Every product document: the live mirror once ready, else a ``query`` scan.
+
+        ``query`` must not filter documents (projection only), since the live
+        mirror holds the whole collection.
+        """
+        if self._live_ready.is_set():
+            # Copy first: snapshot deltas may land while the caller awaits.
+            for doc in list(self._live_docs.values()):
+                yield doc
+            return
+        async for doc in self._stream_docs(query):
+            yield doc
+
+    def _products_query(self) -> Any:
+        """Products collection query projected onto the fields normalisation uses."""
+        return self.db.collection(self.collection).select(_PRODUCT_FIELDS)
+
+    def _get_cached_aggregate(self, key: Tuple[Any, ...]) -> Optional[Any]:
+        entry = self._agg_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._agg_cache[key]
+            return None
+        return value
+
+    def _set_cached_aggregate(
+        self, key: Tuple[Any, ...], value: Any, generation: int
+    ) -> Any:
+        """Cache ``value`` unless the aggregates were invalidated since ``generation``.
+
+        ``generation`` is ``_agg_generation`` read before the scan that
+        produced ``value``; a result predating a catalogue change is returned
+        to its caller but never served to later ones.
+        """
+        if generation == self._agg_generation:
+            self._agg_cache[key] = (time.monotonic() + AGGREGATE_CACHE_TTL_SECONDS, value)
+        return value
+
+    def _invalidate_aggregates(self) -> None:
+        self._agg_generation += 1
+        self._agg_cache.clear()
 
     def _calculate_discount_rate(self, original_price: int, price: int) -> int:
         if original_price <= 0:
@@ -66,16 +402,16 @@ class ProductService:
             "unit_weight": 0,
         }
         if isinstance(stock_value, dict):
-            stock["current"] = self._to_int(
+            stock["current"] = _to_int(
                 stock_value.get("current")
                 or stock_value.get("stock")
                 or stock_value.get("quantity")
             )
-            stock["threshold"] = self._to_int(stock_value.get("threshold"))
-            stock["unit_weight"] = self._to_int(stock_value.get("unit_weight"))
+            stock["threshold"] = _to_int(stock_value.get("threshold"))
+            stock["unit_weight"] = _to_int(stock_value.get("unit_weight"))
             return stock
 
-        current = self._to_int(stock_value)
+        current = _to_int(stock_value)
         if current:
             stock["current"] = current
         return stock
@@ -84,7 +420,7 @@ class ProductService:
         if stock_value is None:
             return None
         if isinstance(stock_value, dict):
-            return self._to_int(stock_value.get("current"))
+            return _to_int(stock_value.get("current"))
         if isinstance(stock_value, (int, float)):
             return int(stock_value)
         try:
@@ -94,19 +430,9 @@ class ProductService:
 
     def _split_to_list(self, value: Any) -> List[str]:
         if isinstance(value, list):
-            return [str(item).strip() for item in value if str(item).strip()]
+            return [text for text in (str(item).strip() for item in value) if text]
         if isinstance(value, str):
-            text = value
-            for sep in ["/", "|", "·", ";"]:
-                text = text.replace(sep, ",")
-            return [part.strip() for part in text.split(",") if part.strip()]
-        return []
-
-    def _normalize_skin_types(self, data: Dict[str, Any]) -> List[str]:
-        if data.get("skin_types"):
-            return self._split_to_list(data["skin_types"])
-        if data.get("spec"):
-            return self._split_to_list(data["spec"])
+            return list(_split_text(value))
         return []
 
     def _normalize_description(self, data: Dict[str, Any]) -> Dict[str, Optional[str]]:
@@ -120,16 +446,47 @@ class ProductService:
         caution = caution or data.get("caution")
         return {"usage": usage, "caution": caution}
 
+    def _normalize_doc(self, doc: Any) -> Dict[str, Any]:
+        """Normalise a document snapshot, memoised on its server ``update_time``."""
+        return self._normalize_product_data(doc.to_dict(), doc.id, doc.update_time)
+
     def _normalize_product_data(
-        self, data: Dict[str, Any], doc_id: Optional[str] = None
+        self,
+        data: Dict[str, Any],
+        doc_id: Optional[str] = None,
+        version: Any = None,
     ) -> Dict[str, Any]:
+        """Normalise a raw document, memoised per doc id while ``version`` is unchanged.
+
+        ``version`` must change on every write to the document, which is why
+        it is the snapshot's server-side update_time: the updated_at field is
+        not bumped by partial writes such as inventory stock syncs. Without a
+        version nothing is memoised. The returned dict is shared between
+        callers and must not be mutated.
+        """
         if not data:
             data = {}
 
-        price_value = self._to_int(
+        if doc_id is None or version is None:
+            return self._build_normalized(data, doc_id)
+
+        cached = self._norm_cache.get(doc_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        normalized = self._build_normalized(data, doc_id)
+        if len(self._norm_cache) >= NORMALIZED_CACHE_MAX_ENTRIES:
+            self._norm_cache.clear()
+        self._norm_cache[doc_id] = (version, normalized)
+        return normalized
+
+    def _build_normalized(
+        self, data: Dict[str, Any], doc_id: Optional[str]
+    ) -> Dict[str, Any]:
+        price_value = _to_int(
             data.get("price") or data.get("price_cur") or data.get("priceCur")
         )
-        original_price = self._to_int(
+        original_price = _to_int(
             data.get("original_price")
             or data.get("price_org")
             or data.get("priceOrg")
@@ -142,7 +499,18 @@ class ProductService:
         if discount_rate is None:
             discount_rate = self._calculate_discount_rate(original_price, price_value)
         else:
-            discount_rate = self._to_int(discount_rate)
+            discount_rate = _to_int(discount_rate)
+
+        # skin_types prefers the skin_types field, spec prefers spec; products
+        # usually carry only one of them, in which case it is split once.
+        spec_source = data.get("spec") or data.get("skin_types")
+        skin_source = data.get("skin_types") or data.get("spec")
+        spec = self._split_to_list(spec_source)
+        skin_types = list(spec) if skin_source is spec_source else self._split_to_list(skin_source)
+        spec_set = frozenset(spec)
+        name = data.get("name") or "상품 미정"
+        brand = data.get("brand") or "기타"
+        ingredients = self._split_to_list(data.get("ingredients"))
 
         normalized = {
             "product_id": data.get("product_id")
@@ -150,8 +518,8 @@ class ProductService:
             or data.get("goods_no")
             or doc_id
             or "unknown_product",
-            "name": data.get("name") or "상품 미정",
-            "brand": data.get("brand") or "기타",
+            "name": name,
+            "brand": brand,
             "category": data.get("category") or data.get("first_category") or "기타",
             "sub_category": data.get("sub_category") or data.get("mid_category") or "",
             "price": price_value,
@@ -160,34 +528,134 @@ class ProductService:
             "is_active": data.get("is_active", True),
             "stock": self._normalize_stock(data.get("stock")),
             "description": self._normalize_description(data),
-            "ingredients": self._split_to_list(data.get("ingredients")),
-            "skin_types": self._normalize_skin_types(data),
-            "spec": self._split_to_list(data.get("spec") or data.get("skin_types")),
+            "ingredients": ingredients,
+            "skin_types": skin_types,
+            "spec": spec,
+            "spec_set": spec_set,
+            "has_universal_spec": not UNIVERSAL_SKIN_TERMS.isdisjoint(spec_set),
             "image_url": data.get("image_url") or data.get("image"),
             "created_at": data.get("created_at"),
             "updated_at": data.get("updated_at"),
             "first_category": data.get("first_category") or data.get("category"),
             "mid_category": data.get("mid_category") or data.get("sub_category"),
             "zone": data.get("zone"),
+            # Lowercased keyword haystack: name, brand and ingredients joined
+            # by a separator no query contains, so matches never span fields.
+            "search_blob": SEARCH_BLOB_SEPARATOR.join(
+                (str(name), str(brand), " ".join(ingredients))
+            ).lower(),
         }
         return normalized
 
-    def _sort_products(
-        self, products: List[ProductSummary], sort_by: SortBy
-    ) -> List[ProductSummary]:
+    def _search_rank(self, sort_by: SortBy) -> Callable[[Dict[str, Any]], float]:
+        """Return an ascending rank function (lower is better) over normalised data."""
         if sort_by == SortBy.PRICE_LOW:
-            return sorted(products, key=lambda p: p.price)
+            return lambda data: data["price"]
         if sort_by == SortBy.PRICE_HIGH:
-            return sorted(products, key=lambda p: p.price, reverse=True)
-        if sort_by == SortBy.DISCOUNT:
-            return sorted(products, key=lambda p: p.discount_rate, reverse=True)
+            return lambda data: -data["price"]
         if sort_by == SortBy.RECENT:
-            return sorted(
-                products,
-                key=lambda p: p.created_at if p.created_at else datetime.min,
-                reverse=True,
+            return lambda data: -_timestamp(data.get("created_at"))
+        return lambda data: -data["discount_rate"]
+
+    @staticmethod
+    def _cached_model(cache: Dict[str, Tuple[Dict[str, Any], Any]], data: Dict[str, Any]) -> Any:
+        """Return the model cached for ``data``, if it was built from this exact dict.
+
+        ``_normalize_product_data`` hands out the same dict object for a
+        document until its update_time changes, so an identity check is
+        equivalent to keying by (doc_id, update_time) and never serves stale data.
+        """
+        cached = cache.get(data["product_id"])
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        return None
+
+    @staticmethod
+    def _store_model(
+        cache: Dict[str, Tuple[Dict[str, Any], Any]],
+        data: Dict[str, Any],
+        model: Any,
+        max_entries: int,
+    ) -> Any:
+        if len(cache) >= max_entries:
+            cache.clear()
+        cache[data["product_id"]] = (data, model)
+        return model
+
+    def _to_summary(self, data: Dict[str, Any]) -> ProductSummary:
+        """Build (or reuse) a ProductSummary from normalised data.
+
+        Models are memoised alongside the normalised dict and must not be
+        mutated by callers.
+        """
+        summary = self._cached_model(self._summary_cache, data)
+        if summary is None:
+            summary = self._store_model(
+                self._summary_cache,
+                data,
+                self._build_summary(data),
+                NORMALIZED_CACHE_MAX_ENTRIES,
+            )
+        return summary
+
+    def _build_summary(self, data: Dict[str, Any]) -> ProductSummary:
+        """Build a ProductSummary from normalised data, skipping re-validation.
+
+        Normalisation guarantees int prices, rates and stock, but the text
+        fields and is_active are passed through as stored. Only data whose
+        types and bounds already satisfy the model goes through
+        ``model_construct``; anything else takes the validating constructor,
+        which coerces or rejects it exactly as before.
+        """
+        stock = data["stock"]
+        if (
+            all(type(data[field]) is str for field in _SUMMARY_STR_FIELDS)
+            and all(
+                data[field] is None or type(data[field]) is str
+                for field in _SUMMARY_OPTIONAL_STR_FIELDS
+            )
+            and type(data["is_active"]) is bool
+            and data["price"] >= 0
+            and data["original_price"] >= 0
+            and 0 <= data["discount_rate"] <= 100
+            and stock["current"] >= 0
+            and stock["threshold"] >= 0
+            and stock["unit_weight"] >= 0
+        ):
+            return ProductSummary.model_construct(
+                **{**data, "stock": ProductStock.model_construct(**stock)}
             )
-        return sorted(products, key=lambda p: p.discount_rate, reverse=True)
+        return ProductSummary(**data)
+
+    def _best_products(
+        self,
+        candidates: List[Dict[str, Any]],
+        limit: int,
+        key: Callable[[Dict[str, Any]], Any],
+    ) -> List[ProductSummary]:
+        """Hydrate only the ``limit`` lowest-``key`` candidates into models.
+
+        Ranks normalised dicts with a heap (O(N + limit log N)) so only the
+        winners pay for pydantic validation. Candidates that fail validation
+        are skipped and the next best is used; ties keep input order, matching
+        a stable sort.
+        """
+        heap = [(key(data), index, data) for index, data in enumerate(candidates)]
+        return self._pop_best(heap, limit)
+
+    def _pop_best(
+        self, heap: List[Tuple[Any, int, Dict[str, Any]]], limit: int
+    ) -> List[ProductSummary]:
+        """Heapify ``(key, index, data)`` entries and hydrate the ``limit`` smallest."""
+        heapq.heapify(heap)
+        products: List[ProductSummary] = []
+        while heap and len(products) < limit:
+            _, _, data = heapq.heappop(heap)
+            try:
+                products.append(self._to_summary(data))
+            except ValidationError:
+                continue
+        return products
 
     # ------------------------------------------------------------------ #
     # CRUD helpers
@@ -195,11 +663,16 @@ class ProductService:
 
     async def get_product_by_id(self, product_id: str) -> Optional[ProductDetail]:
         try:
-            doc = self.db.collection(self.collection).document(product_id).get()
+            doc = await self.async_db.collection(self.collection).document(product_id).get()
             if not doc.exists:
                 return None
-            data = self._normalize_product_data(doc.to_dict(), doc.id)
-            return ProductDetail(**data)
+            data = self._normalize_doc(doc)
+            detail = self._cached_model(self._detail_cache, data)
+            if detail is None:
+                detail = self._store_model(
+                    self._detail_cache, data, ProductDetail(**data), DETAIL_CACHE_MAX_ENTRIES
+                )
+            return detail
         except Exception as exc:
             logger.error("Failed to fetch product %s: %s", product_id, exc)
             raise
@@ -208,17 +681,18 @@ class ProductService:
         self, limit: Optional[int] = None, offset: int = 0
     ) -> List[ProductSummary]:
         try:
-            docs = list(self.db.collection(self.collection).stream())
-            docs = docs[offset:]
+            # Let Firestore skip/limit instead of materialising the whole collection.
+            query = self._products_query()
+            if offset:
+                query = query.offset(offset)
             if limit:
-                docs = docs[:limit]
-
+                query = query.limit(limit)
             products: List[ProductSummary] = []
-            for doc in docs:
-                data = self._normalize_product_data(doc.to_dict(), doc.id)
+            async for doc in self._stream_docs(query):
+                data = self._normalize_doc(doc)
                 if not data.get("is_active", True):
                     continue
-                products.append(ProductSummary(**data))
+                products.append(self._to_summary(data))
             return products
         except Exception as exc:
             logger.error("Failed to fetch product list: %s", exc)
@@ -228,17 +702,16 @@ class ProductService:
         self, category: str, limit: int = 20
     ) -> List[ProductSummary]:
         try:
-            docs = (
-                self.db.collection(self.collection)
+            docs = await self._fetch_docs(
+                self._products_query()
                 .where("is_active", "==", True)
                 .where("category", "==", category)
                 .limit(limit)
-                .stream()
             )
             products = []
             for doc in docs:
-                data = self._normalize_product_data(doc.to_dict(), doc.id)
-                products.append(ProductSummary(**data))
+                data = self._normalize_doc(doc)
+                products.append(self._to_summary(data))
             return products
         except Exception as exc:
             logger.error("Failed to fetch category products: %s", exc)
@@ -248,17 +721,16 @@ class ProductService:
         self, brand: str, limit: int = 20
     ) -> List[ProductSummary]:
         try:
-            docs = (
-                self.db.collection(self.collection)
+            docs = await self._fetch_docs(
+                self._products_query()
                 .where("is_active", "==", True)
                 .where("brand", "==", brand)
                 .limit(limit)
-                .stream()
             )
             products = []
             for doc in docs:
-                data = self._normalize_product_data(doc.to_dict(), doc.id)
-                products.append(ProductSummary(**data))
+                data = self._normalize_doc(doc)
+                products.append(self._to_summary(data))
             return products
         except Exception as exc:
             logger.error("Failed to fetch brand products: %s", exc)
@@ -268,73 +740,116 @@ class ProductService:
     # Search / filters
     # ------------------------------------------------------------------ #
 
-    async def search_products(self, params: ProductSearchParams) -> Dict[str, Any]:
-        try:
-            docs = list(self.db.collection(self.collection).stream())
-            filtered: List[ProductSummary] = []
+    async def _search_matches(
+        self, docs: AsyncIterator[Any], params: ProductSearchParams
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Yield ``(doc_id, normalised product)`` for ``docs`` that pass every search filter."""
+        tokens = query_tokens(params.query) if params.query else ()
+        keyword = tokens[0] if len(tokens) == 1 else None
+        requested_specs = frozenset(
+            spec.strip() for spec in params.spec or () if isinstance(spec, str) and spec.strip()
+        )
+        request_has_all = not UNIVERSAL_SKIN_TERMS.isdisjoint(requested_specs)
 
-            for doc in docs:
-                try:
-                    data = self._normalize_product_data(doc.to_dict(), doc.id)
-                except Exception as convert_error:
-                    logger.warning("Failed to normalize %s: %s", doc.id, convert_error)
-                    continue
+        async for doc in docs:
+            data = self._normalize_doc(doc)
 
-                if params.query:
-                    keyword = params.query.lower()
-                    name_match = keyword in data.get("name", "").lower()
-                    brand_match = keyword in data.get("brand", "").lower()
-                    ingredient_match = keyword in " ".join(
-                        data.get("ingredients", [])
-                    ).lower()
-                    if not (name_match or brand_match or ingredient_match):
-                        continue
-
-                if params.first_category and data.get("first_category") != params.first_category:
+            if keyword is not None:
+                if keyword not in data["search_blob"]:
                     continue
-                if params.mid_category and data.get("mid_category") != params.mid_category:
+            elif tokens:
+                blob = data["search_blob"]
+                if not all(token in blob for token in tokens):
                     continue
-                if params.brand and data.get("brand") != params.brand:
+
+            if params.first_category and data.get("first_category") != params.first_category:
+                continue
+            if params.mid_category and data.get("mid_category") != params.mid_category:
+                continue
+            if params.brand and data.get("brand") != params.brand:
+                continue
+
+            price = data.get("price", 0)
+            if params.min_price is not None and price < params.min_price:
+                continue
+            if params.max_price is not None and price > params.max_price:
+                continue
+
+            if requested_specs and not data["has_universal_spec"]:
+                product_specs = data["spec_set"]
+                if request_has_all:
+                    match_found = bool(product_specs)
+                else:
+                    match_found = not requested_specs.isdisjoint(product_specs)
+                if not match_found:
                     continue
 
-                price = data.get("price", 0)
-                if params.min_price is not None and price < params.min_price:
+            if params.in_stock:
+                stock_info = data.get("stock", {})
+                if stock_info.get("current", 0) <= 0:
                     continue
-                if params.max_price is not None and price > params.max_price:
+
+            yield doc.id, data
+
+    async def search_products(self, params: ProductSearchParams) -> Dict[str, Any]:
+        try:
+            if self._live_ready.is_set():
+                # The live index is kept current by the snapshot listener, so
+                # only its candidates (keyword, facet, price and stock postings
+                # intersected) are read; they are re-checked below. An empty
+                # keyword matches every product.
+                index = self._text_index
+                doc_ids = index.filter_facets(
+                    index.search(params.query or ""),
+                    first_category=params.first_category,
+                    mid_category=params.mid_category,
+                    brand=params.brand,
+                )
+                doc_ids = index.filter_price(
+                    doc_ids,
+                    min_price=params.min_price,
+                    max_price=params.max_price,
+                    in_stock=bool(params.in_stock),
+                )
+                docs = self._get_docs(sorted(doc_ids))
+            else:
+                # Without the listener there is no index that is guaranteed
+                # fresh, so every product is scanned, as keyword matches on new
+                # or renamed products must not be missed. No Firestore filters
+                # either: facets are matched against normalised values
+                # (first_category falls back to category, mid_category to
+                # sub_category, a missing brand to "기타"), which a where() on
+                # the raw field would miss.
+                docs = self._stream_docs(self._products_query())
+
+            # Results are ordered by (rank, doc id). A cursor resumes after the
+            # previous page's last key; otherwise the page number is used.
+            # Only the best ``keep`` matches are held, in a bounded heap with
+            # the worst on top, while every match is counted for the totals.
+            rank = self._search_rank(params.sort_by)
+            after = _decode_cursor(params.cursor) if params.cursor else None
+            skip = 0 if after else (params.page - 1) * params.page_size
+            keep = skip + params.page_size
+            heap: List[_WorstFirst] = []
+            total = 0
+            remaining = 0
+            async for doc_id, data in self._search_matches(docs, params):
+                total += 1
+                key = (rank(data), doc_id)
+                if after is not None and key <= after:
                     continue
+                remaining += 1
+                if len(heap) < keep:
+                    heapq.heappush(heap, _WorstFirst((*key, data)))
+                elif key < heap[0][:2]:
+                    heapq.heapreplace(heap, _WorstFirst((*key, data)))
 
-                if params.spec:
-                    requested_specs = [
-                        spec.strip() for spec in params.spec if isinstance(spec, str) and spec.strip()
-                    ]
-                    product_specs = [
-                        spec.strip() for spec in data.get("spec", []) if isinstance(spec, str) and spec.strip()
-                    ]
-                    if requested_specs:
-                        universal_terms = {"모든 피부 타입", "모든피부", "모든 피부"}
-                        product_has_all = any(spec in universal_terms for spec in product_specs)
-                        if not product_has_all:
-                            request_has_all = any(spec in universal_terms for spec in requested_specs)
-                            if request_has_all:
-                                match_found = bool(product_specs)
-                            else:
-                                match_found = any(spec in product_specs for spec in requested_specs)
-                            if not match_found:
-                                continue
-
-                if params.in_stock:
-                    stock_info = data.get("stock", {})
-                    if stock_info.get("current", 0) <= 0:
-                        continue
-
-                filtered.append(ProductSummary(**data))
-
-            filtered = self._sort_products(filtered, params.sort_by)
-            total = len(filtered)
             total_pages = (total + params.page_size - 1) // params.page_size
-            start_idx = (params.page - 1) * params.page_size
-            end_idx = start_idx + params.page_size
-            products_page = filtered[start_idx:end_idx]
+            ranked = sorted(heap, reverse=True)[skip:]
+            products_page = [self._to_summary(data) for _, _, data in ranked]
+            next_cursor = None
+            if ranked and skip + len(ranked) < remaining:
+                next_cursor = _encode_cursor(ranked[-1][0], ranked[-1][1])
 
             return {
                 "total": total,
@@ -342,14 +857,20 @@ class ProductService:
                 "page_size": params.page_size,
                 "total_pages": total_pages,
                 "products": products_page,
+                "next_cursor": next_cursor,
             }
         except Exception as exc:
             logger.error("Product search failed: %s", exc)
             raise
 
     async def get_filter_options(self) -> FilterOptions:
+        cache_key = ("filter_options",)
+        cached = self._get_cached_aggregate(cache_key)
+        if cached is not None:
+            return cached
+        generation = self._agg_generation
         try:
-            docs = self.db.collection(self.collection).stream()
+            docs = self._catalog_docs(self._products_query())
             brands = set()
             first_categories = set()
             mid_categories = set()
@@ -357,12 +878,8 @@ class ProductService:
             min_price = float("inf")
             max_price = 0
 
-            for doc in docs:
-                try:
-                    data = self._normalize_product_data(doc.to_dict(), doc.id)
-                except Exception as convert_error:
-                    logger.warning("Failed to normalize filters for %s: %s", doc.id, convert_error)
-                    continue
+            async for doc in docs:
+                data = self._normalize_doc(doc)
 
                 if data.get("brand"):
                     brands.add(data["brand"])
@@ -381,11 +898,15 @@ class ProductService:
             if min_price == float("inf"):
                 min_price = 0
 
-            return FilterOptions(
-                brands=sorted(brands),
-                first_categories=sorted(first_categories),
-                mid_categories=sorted(mid_categories),
-                spec=sorted(specs),
+            return self._set_cached_aggregate(
+                cache_key,
+                FilterOptions(
+                    brands=sorted(brands),
+                    first_categories=sorted(first_categories),
+                    mid_categories=sorted(mid_categories),
+                    spec=sorted(specs),
+                ),
+                generation,
             )
         except Exception as exc:
             logger.error("Failed to fetch filter options: %s", exc)
@@ -395,53 +916,84 @@ class ProductService:
     # Statistics and derived data
     # ------------------------------------------------------------------ #
 
+    async def _get_catalog_aggregates(self) -> Dict[str, Any]:
+        """Compute every catalogue counter from one projected scan (TTL cached).
+
+        Counts, categories, sub-categories and brands are all derived from the
+        same handful of fields, so one read of the collection feeds every
+        statistics endpoint instead of each endpoint re-scanning it.
+        """
+        cache_key = ("catalog_aggregates",)
+        cached = self._get_cached_aggregate(cache_key)
+        if cached is not None:
+            return cached
+        generation = self._agg_generation
+
+        query = self.db.collection(self.collection).select(
+            [
+                "is_active",
+                "category",
+                "first_category",
+                "sub_category",
+                "mid_category",
+                "brand",
+            ]
+        )
+        total_count = 0
+        active_count = 0
+        by_category: Dict[str, int] = {}
+        by_brand: Dict[str, int] = {}
+        by_sub_category: Dict[str, int] = {}
+        sub_categories_by_category: Dict[str, Dict[str, int]] = {}
+        async for doc in self._catalog_docs(query):
+            data = doc.to_dict() or {}
+            total_count += 1
+            if not data.get("is_active", True):
+                continue
+            active_count += 1
+            category = data.get("category") or data.get("first_category") or "기타"
+            sub_category = data.get("sub_category") or data.get("mid_category") or ""
+            brand = data.get("brand") or "기타"
+            by_category[category] = by_category.get(category, 0) + 1
+            by_brand[brand] = by_brand.get(brand, 0) + 1
+            by_sub_category[sub_category] = by_sub_category.get(sub_category, 0) + 1
+            category_subs = sub_categories_by_category.setdefault(category, {})
+            category_subs[sub_category] = category_subs.get(sub_category, 0) + 1
+
+        return self._set_cached_aggregate(
+            cache_key,
+            {
+                "total_count": total_count,
+                "active_count": active_count,
+                "by_category": by_category,
+                "by_brand": by_brand,
+                "by_sub_category": by_sub_category,
+                "sub_categories_by_category": sub_categories_by_category,
+            },
+            generation,
+        )
+
     async def get_product_count(self) -> Dict[str, Any]:
         try:
-            docs = list(self.db.collection(self.collection).stream())
-            normalized_docs = []
-            for doc in docs:
-                try:
-                    normalized_docs.append(self._normalize_product_data(doc.to_dict(), doc.id))
-                except Exception as convert_error:
-                    logger.warning("Failed to normalize product for count %s: %s", doc.id, convert_error)
-
-            total_count = len(normalized_docs)
-            active_count = sum(1 for data in normalized_docs if data.get("is_active", True))
-            inactive_count = total_count - active_count
-
-            by_category: Dict[str, int] = {}
-            for data in normalized_docs:
-                if data.get("is_active", True):
-                    category = data.get("category", "기타")
-                    by_category[category] = by_category.get(category, 0) + 1
-
+            aggregates = await self._get_catalog_aggregates()
+            total_count = aggregates["total_count"]
+            active_count = aggregates["active_count"]
             return {
                 "total_count": total_count,
                 "active_count": active_count,
-                "inactive_count": inactive_count,
-                "by_category": by_category,
+                "inactive_count": total_count - active_count,
+                "by_category": dict(aggregates["by_category"]),
             }
         except Exception as exc:
             logger.error("Failed to fetch product count: %s", exc)
             raise
 
-
     async def get_categories(self) -> List[CategoryInfo]:
         try:
-            docs = (
-                self.db.collection(self.collection)
-                .where("is_active", "==", True)
-                .stream()
-            )
-            category_counts: Dict[str, int] = {}
-            for doc in docs:
-                data = self._normalize_product_data(doc.to_dict(), doc.id)
-                category = data.get("category", "기타")
-                category_counts[category] = category_counts.get(category, 0) + 1
-
+            aggregates = await self._get_catalog_aggregates()
             return [
                 CategoryInfo(category=cat, product_count=count)
-                for cat, count in sorted(category_counts.items())
+                for cat, count in sorted(aggregates["by_category"].items())
             ]
         except Exception as exc:
             logger.error("Failed to fetch categories: %s", exc)
@@ -451,17 +1003,11 @@ class ProductService:
         self, category: Optional[str] = None
     ) -> List[SubCategoryInfo]:
         try:
-            query = self.db.collection(self.collection).where("is_active", "==", True)
+            aggregates = await self._get_catalog_aggregates()
             if category:
-                query = query.where("category", "==", category)
-
-            docs = query.stream()
-            sub_category_counts: Dict[str, int] = {}
-            for doc in docs:
-                data = self._normalize_product_data(doc.to_dict(), doc.id)
-                sub_cat = data.get("sub_category", "기타")
-                sub_category_counts[sub_cat] = sub_category_counts.get(sub_cat, 0) + 1
-
+                sub_category_counts = aggregates["sub_categories_by_category"].get(category, {})
+            else:
+                sub_category_counts = aggregates["by_sub_category"]
             return [
                 SubCategoryInfo(sub_category=sub_cat, product_count=count)
                 for sub_cat, count in sorted(sub_category_counts.items())
@@ -472,20 +1018,10 @@ class ProductService:
 
     async def get_brands(self) -> List[BrandInfo]:
         try:
-            docs = (
-                self.db.collection(self.collection)
-                .where("is_active", "==", True)
-                .stream()
-            )
-            brand_counts: Dict[str, int] = {}
-            for doc in docs:
-                data = self._normalize_product_data(doc.to_dict(), doc.id)
-                brand = data.get("brand", "기타")
-                brand_counts[brand] = brand_counts.get(brand, 0) + 1
-
+            aggregates = await self._get_catalog_aggregates()
             return [
                 BrandInfo(brand=brand, product_count=count)
-                for brand, count in sorted(brand_counts.items())
+                for brand, count in sorted(aggregates["by_brand"].items())
             ]
         except Exception as exc:
             logger.error("Failed to fetch brands: %s", exc)
@@ -521,70 +1057,68 @@ class ProductService:
         if not base_product:
             return await self._get_popular_products(limit)
 
-        docs = (
-            self.db.collection(self.collection)
+        base_price = base_product.price
+        if not base_price:
+            return []
+
+        docs = await self._fetch_docs(
+            self._products_query()
             .where("is_active", "==", True)
             .where("category", "==", base_product.category)
             .limit(limit * 2)
-            .stream()
         )
-        products: List[ProductSummary] = []
-        for doc in docs:
+
+        # Within 30% of the base price, closest first; each diff is computed once.
+        threshold = 0.3 * base_price
+        heap: List[Tuple[Any, int, Dict[str, Any]]] = []
+        for index, doc in enumerate(docs):
             if doc.id == product_id:
                 continue
-            try:
-                data = self._normalize_product_data(doc.to_dict(), doc.id)
-                product = ProductSummary(**data)
-                if base_product.price:
-                    price_diff = abs(product.price - base_product.price) / base_product.price
-                    if price_diff <= 0.3:
-                        products.append(product)
-            except Exception:
-                continue
+            data = self._normalize_doc(doc)
+            diff = abs(data["price"] - base_price)
+            if diff <= threshold:
+                heap.append((diff, index, data))
 
-        products.sort(key=lambda p: abs(p.price - base_product.price))
-        return products[:limit]
+        return self._pop_best(heap, limit)
 
     async def _get_products_by_skin_type(
         self, skin_type: str, limit: int
     ) -> List[ProductSummary]:
-        docs = (
-            self.db.collection(self.collection)
+        if self._live_ready.is_set():
+            # Skin types are posted in the live index, so only matching
+            # products are read, from the whole catalogue.
+            index = self._text_index
+            doc_ids = index.facet_members("skin_types", (skin_type, *UNIVERSAL_SKIN_TERMS))
+            candidates = []
+            async for doc in self._get_docs(sorted(doc_ids)):
+                data = self._normalize_doc(doc)
+                if data["is_active"]:
+                    candidates.append(data)
+            return self._best_products(candidates, limit, key=lambda d: -d["discount_rate"])
+
+        docs = await self._fetch_docs(
+            self._products_query()
             .where("is_active", "==", True)
             .limit(200)
-            .stream()
         )
-        universal_terms = {"모든 피부 타입", "모든피부", "모든 피부"}
-        products: List[ProductSummary] = []
+        candidates: List[Dict[str, Any]] = []
         for doc in docs:
-            try:
-                data = self._normalize_product_data(doc.to_dict(), doc.id)
-                skin_types = data.get("skin_types", [])
-                if skin_type in skin_types or any(term in skin_types for term in universal_terms):
-                    products.append(ProductSummary(**data))
-            except Exception:
-                continue
+            data = self._normalize_doc(doc)
+            skin_types = data.get("skin_types", [])
+            if skin_type in skin_types or not UNIVERSAL_SKIN_TERMS.isdisjoint(skin_types):
+                candidates.append(data)
 
-        products.sort(key=lambda p: p.discount_rate, reverse=True)
-        return products[:limit]
+        return self._best_products(candidates, limit, key=lambda d: -d["discount_rate"])
 
     async def _get_popular_products(self, limit: int) -> List[ProductSummary]:
-        docs = (
-            self.db.collection(self.collection)
+        docs = await self._fetch_docs(
+            self._products_query()
             .where("is_active", "==", True)
             .limit(200)
-            .stream()
         )
-        products: List[ProductSummary] = []
-        for doc in docs:
-            try:
-                data = self._normalize_product_data(doc.to_dict(), doc.id)
-                products.append(ProductSummary(**data))
-            except Exception:
-                continue
+        candidates = [self._normalize_doc(doc) for doc in docs]
 
-        products.sort(key=lambda p: p.discount_rate, reverse=True)
-        return products[:limit]
+        return self._best_products(candidates, limit, key=lambda d: -d["discount_rate"])
 
 
 product_service = ProductService()
@@ -39,9 +39,13 @@ class PathFinder:
         Returns:
             (경로, 총 거리, 예상 시간)
         """
+        # 이미 목표 지점에 있으면 경로 계산 생략 (경로 형태는 기존과 같은 [start, end])
+        if start.x == end.x and start.y == end.y:
+            return [start, end], 0.0, 0.0
+
         # 간단한 직선 경로 (장애물 없는 경우)
         # TODO: 실제 A* 알고리즘 구현
-        
+
         path = self._calculate_simple_path(start, end)
         distance = self._calculate_total_distance(path)
         time = distance / speed if speed > 0 else 0
@@ -63,25 +67,24 @@ class PathFinder:
         distance = self._distance(start, end)
         num_waypoints = max(1, int(distance / 2.0))
         
+        # 좌표 값은 한 번만 꺼내고, Coordinate는 실제 경유지에만 생성
+        start_x, start_y = start.x, start.y
+        delta_x, delta_y = end.x - start_x, end.y - start_y
         for i in range(1, num_waypoints):
             ratio = i / num_waypoints
-            mid_x = start.x + (end.x - start.x) * ratio
-            mid_y = start.y + (end.y - start.y) * ratio
-            path.append(Coordinate(x=mid_x, y=mid_y))
+            path.append(Coordinate(x=start_x + delta_x * ratio, y=start_y + delta_y * ratio))
         
         path.append(end)
         return path
     
     def _calculate_total_distance(self, path: List[Coordinate]) -> float:
         """경로의 총 거리 계산"""
-        total = 0.0
-        for i in range(len(path) - 1):
-            total += self._distance(path[i], path[i + 1])
-        return total
+        distance = self._distance
+        return sum(distance(a, b) for a, b in zip(path, path[1:]))
     
     def _distance(self, a: Coordinate, b: Coordinate) -> float:
         """두 점 사이의 유클리드 거리"""
-        return math.sqrt((b.x - a.x) ** 2 + (b.y - a.y) ** 2)
+        return math.hypot(b.x - a.x, b.y - a.y)
     
     def _heuristic(self, a: Coordinate, b: Coordinate) -> float:
         """A* 휴리스틱 (맨하탄 거리)"""
@@ -108,16 +111,16 @@ class PathFinder:
         
         smoothed = [path[0]]
         
+        # 각 구간의 방향은 한 번만 계산해 다음 지점과 공유
+        prev_heading = self._heading(path[0], path[1])
         for i in range(1, len(path) - 1):
             # 각도 변화가 큰 지점만 포함
-            prev = path[i - 1]
             curr = path[i]
-            next_point = path[i + 1]
-            
-            angle_change = self._calculate_angle_change(prev, curr, next_point)
+            heading = self._heading(curr, path[i + 1])
             
-            if angle_change > 15:  # 15도 이상 변화
+            if self._heading_change(prev_heading, heading) > 15:  # 15도 이상 변화
                 smoothed.append(curr)
+            prev_heading = heading
         
         smoothed.append(path[-1])
         return smoothed
@@ -129,8 +132,13 @@ class PathFinder:
         p3: Coordinate
     ) -> float:
         """세 점 사이의 각도 변화 계산"""
-        angle1 = math.atan2(p2.y - p1.y, p2.x - p1.x)
-        angle2 = math.atan2(p3.y - p2.y, p3.x - p2.x)
-        
+        return self._heading_change(self._heading(p1, p2), self._heading(p2, p3))
+    
+    def _heading(self, a: Coordinate, b: Coordinate) -> float:
+        """a → b 구간의 방향 (라디안)"""
+        return math.atan2(b.y - a.y, b.x - a.x)
+    
+    def _heading_change(self, angle1: float, angle2: float) -> float:
+        """두 방향 사이의 각도 변화 (도)"""
         diff = abs(math.degrees(angle2 - angle1))
         return min(diff, 360 - diff)
\ No newline at end of file